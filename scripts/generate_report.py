@@ -1,81 +1,371 @@
 from __future__ import annotations
 
+import argparse
+import csv
+import io
+import json
+import math
 import os
 import sqlite3
+import sys
+from datetime import datetime, timezone
 from pathlib import Path
 
+from net_detective.core.slo import is_success
+
 DB_PATH = os.getenv("DB_PATH", "net_detective.db")
 REPORT_PATH = Path("reports/performance_report.md")
+CHUNK_SIZE = 10_000
 
+# Response times are binned on a log scale with 1% wide buckets, so the
+# percentile estimate is within 1% of the exact value while each target
+# holds at most a few thousand counters however many rows it has.
+HISTOGRAM_GROWTH = 1.01
+HISTOGRAM_MIN_MS = 0.01
 
-def percentile(values: list[float], pct: float) -> float | None:
-    if not values:
-        return None
-    values_sorted = sorted(values)
-    index = int(round((pct / 100) * (len(values_sorted) - 1)))
-    return values_sorted[index]
+SUMMARY_FIELDS = [
+    "target_id",
+    "name",
+    "url",
+    "total",
+    "availability",
+    "avg_response_time_ms",
+    "p95_response_time_ms",
+    "failures",
+    "alerts",
+]
 
 
-def main() -> None:
-    if not Path(DB_PATH).exists():
-        print(f"Database not found: {DB_PATH}")
-        return
+def _bucket_of(value: float) -> int:
+    if value <= HISTOGRAM_MIN_MS:
+        return 0
+    return int(math.log(value / HISTOGRAM_MIN_MS, HISTOGRAM_GROWTH)) + 1
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
 
-    targets = conn.execute("SELECT id, name, url FROM targets").fetchall()
-    rows = conn.execute(
-        """
-        SELECT target_id, status_code, response_time_ms, error
-        FROM probe_results
-        """
-    ).fetchall()
-    alerts = conn.execute("SELECT target_id FROM alerts").fetchall()
+def _bucket_value(bucket: int) -> float:
+    if bucket == 0:
+        return HISTOGRAM_MIN_MS
+    low = HISTOGRAM_MIN_MS * HISTOGRAM_GROWTH ** (bucket - 1)
+    return low * math.sqrt(HISTOGRAM_GROWTH)
 
-    results_by_target: dict[int, list[sqlite3.Row]] = {}
-    for row in rows:
-        results_by_target.setdefault(row["target_id"], []).append(row)
 
-    alerts_by_target: dict[int, int] = {}
-    for row in alerts:
-        alerts_by_target[row["target_id"]] = alerts_by_target.get(row["target_id"], 0) + 1
+class TargetStats:
+    """Fixed-size running aggregates for one target."""
 
-    lines = ["# Performance Report", "", "| Target | Availability | Avg (ms) | P95 (ms) | Failures | Alerts |", "| --- | --- | --- | --- | --- | --- |"]
+    def __init__(self) -> None:
+        self.total = 0
+        self.success = 0
+        self.rt_count = 0
+        self.rt_sum = 0.0
+        self.rt_min: float | None = None
+        self.rt_max: float | None = None
+        self.histogram: dict[int, int] = {}
+        self.alerts = 0
+
+    def add(self, status_code: int | None, response_time_ms: float | None, error: str | None) -> None:
+        self.total += 1
+        if is_success(status_code, error):
+            self.success += 1
+        if response_time_ms is None:
+            return
+        self.rt_count += 1
+        self.rt_sum += response_time_ms
+        self.rt_min = response_time_ms if self.rt_min is None else min(self.rt_min, response_time_ms)
+        self.rt_max = response_time_ms if self.rt_max is None else max(self.rt_max, response_time_ms)
+        bucket = _bucket_of(response_time_ms)
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    @property
+    def failures(self) -> int:
+        return self.total - self.success
+
+    @property
+    def availability(self) -> float | None:
+        return (self.success / self.total) if self.total else None
+
+    @property
+    def avg_response_time_ms(self) -> float | None:
+        return (self.rt_sum / self.rt_count) if self.rt_count else None
+
+    def percentile(self, pct: float) -> float | None:
+        if not self.rt_count:
+            return None
+        # Same rank as the exact nearest-rank lookup this replaced.
+        rank = int(round((pct / 100) * (self.rt_count - 1)))
+        seen = 0
+        for bucket in sorted(self.histogram):
+            seen += self.histogram[bucket]
+            if seen > rank:
+                return min(max(_bucket_value(bucket), self.rt_min), self.rt_max)
+        return self.rt_max
+
+    def to_dict(self) -> dict:
+        return {
+            "total": self.total,
+            "success": self.success,
+            "rt_count": self.rt_count,
+            "rt_sum": self.rt_sum,
+            "rt_min": self.rt_min,
+            "rt_max": self.rt_max,
+            "histogram": {str(bucket): count for bucket, count in self.histogram.items()},
+            "alerts": self.alerts,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> TargetStats:
+        stats = cls()
+        stats.total = data["total"]
+        stats.success = data["success"]
+        stats.rt_count = data["rt_count"]
+        stats.rt_sum = data["rt_sum"]
+        stats.rt_min = data["rt_min"]
+        stats.rt_max = data["rt_max"]
+        stats.histogram = {int(bucket): count for bucket, count in data["histogram"].items()}
+        stats.alerts = data["alerts"]
+        return stats
 
-    def is_success(row: sqlite3.Row) -> bool:
-        if row["error"]:
-            return False
-        if row["status_code"] is None:
-            return False
-        return 200 <= row["status_code"] <= 399
 
+def _normalize_ts(value: str) -> str:
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"invalid ISO timestamp: {value!r}") from exc
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+
+def _filters(
+    since: str | None,
+    until: str | None,
+    target_ids: list[int] | None,
+    last_id: int,
+) -> tuple[str, list]:
+    clauses = ["id > ?"]
+    params: list = [last_id]
+    if since:
+        clauses.append("ts >= ?")
+        params.append(since)
+    if until:
+        clauses.append("ts < ?")
+        params.append(until)
+    if target_ids is not None:
+        clauses.append(f"target_id IN ({', '.join('?' for _ in target_ids)})")
+        params.extend(target_ids)
+    return " AND ".join(clauses), params
+
+
+def _stream(conn: sqlite3.Connection, sql: str, params: list, chunk_size: int):
+    cursor = conn.execute(sql, params)
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield from rows
+
+
+def aggregate(
+    conn: sqlite3.Connection,
+    since: str | None = None,
+    until: str | None = None,
+    target_ids: list[int] | None = None,
+    state: dict | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> dict:
+    """Fold probe results and alerts newer than ``state`` into per-target stats.
+
+    ``state`` is the value returned by a previous call (or loaded from a
+    checkpoint); only rows with a higher id than it has seen are read.
+    """
+    state = state or {"last_probe_id": 0, "last_alert_id": 0, "targets": {}}
+    stats = {
+        int(target_id): TargetStats.from_dict(data)
+        for target_id, data in state["targets"].items()
+    }
+    last_probe_id = state["last_probe_id"]
+    last_alert_id = state["last_alert_id"]
+
+    where, params = _filters(since, until, target_ids, last_probe_id)
+    for row in _stream(
+        conn,
+        f"""
+        SELECT id, target_id, status_code, response_time_ms, error
+        FROM probe_results
+        WHERE {where}
+        ORDER BY id
+        """,
+        params,
+        chunk_size,
+    ):
+        target_stats = stats.get(row["target_id"])
+        if target_stats is None:
+            target_stats = stats[row["target_id"]] = TargetStats()
+        target_stats.add(row["status_code"], row["response_time_ms"], row["error"])
+        last_probe_id = row["id"]
+
+    where, params = _filters(since, until, target_ids, last_alert_id)
+    for row in _stream(
+        conn,
+        f"SELECT id, target_id FROM alerts WHERE {where} ORDER BY id",
+        params,
+        chunk_size,
+    ):
+        target_stats = stats.get(row["target_id"])
+        if target_stats is None:
+            target_stats = stats[row["target_id"]] = TargetStats()
+        target_stats.alerts += 1
+        last_alert_id = row["id"]
+
+    return {
+        "last_probe_id": last_probe_id,
+        "last_alert_id": last_alert_id,
+        "targets": {str(target_id): data.to_dict() for target_id, data in stats.items()},
+    }
+
+
+def summarize(targets: list[sqlite3.Row], state: dict) -> list[dict]:
+    summary = []
     for target in targets:
-        target_rows = results_by_target.get(target["id"], [])
-        total = len(target_rows)
-        success = sum(1 for row in target_rows if is_success(row))
-        failures = total - success
-        response_times = [row["response_time_ms"] for row in target_rows if row["response_time_ms"] is not None]
-        avg_rt = sum(response_times) / len(response_times) if response_times else None
-        p95_rt = percentile(response_times, 95) if response_times else None
-        availability = (success / total) if total else None
-        alerts_count = alerts_by_target.get(target["id"], 0)
+        data = state["targets"].get(str(target["id"]))
+        stats = TargetStats.from_dict(data) if data else TargetStats()
+        summary.append(
+            {
+                "target_id": target["id"],
+                "name": target["name"],
+                "url": target["url"],
+                "total": stats.total,
+                "availability": stats.availability,
+                "avg_response_time_ms": stats.avg_response_time_ms,
+                "p95_response_time_ms": stats.percentile(95),
+                "failures": stats.failures,
+                "alerts": stats.alerts,
+            }
+        )
+    return summary
+
+
+def render_markdown(summary: list[dict]) -> str:
+    lines = ["# Performance Report", "", "| Target | Availability | Avg (ms) | P95 (ms) | Failures | Alerts |", "| --- | --- | --- | --- | --- | --- |"]
+    for item in summary:
+        availability = item["availability"]
+        avg_rt = item["avg_response_time_ms"]
+        p95_rt = item["p95_response_time_ms"]
         lines.append(
             "| {name} | {availability} | {avg} | {p95} | {failures} | {alerts} |".format(
-                name=target["name"],
+                name=item["name"],
                 availability=f"{availability:.2%}" if availability is not None else "N/A",
                 avg=f"{avg_rt:.1f}" if avg_rt is not None else "N/A",
                 p95=f"{p95_rt:.1f}" if p95_rt is not None else "N/A",
-                failures=failures,
-                alerts=alerts_count,
+                failures=item["failures"],
+                alerts=item["alerts"],
             )
         )
 
     lines.extend(["", "Conclusion: Basic SLA metrics captured for configured targets."])
+    return "\n".join(lines)
+
+
+def _write(path: Path, text: str) -> None:
+    # Write next to the target and swap it in so readers never see a partial file.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(text, encoding="utf-8", newline="")
+    os.replace(tmp_path, path)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Summarise probe results per target.")
+    parser.add_argument("--db", default=DB_PATH, help="SQLite database path")
+    parser.add_argument(
+        "--since",
+        type=_normalize_ts,
+        help="only include rows with ts >= this ISO timestamp (UTC if no offset)",
+    )
+    parser.add_argument(
+        "--until",
+        type=_normalize_ts,
+        help="only include rows with ts < this ISO timestamp (UTC if no offset)",
+    )
+    parser.add_argument(
+        "--target",
+        action="append",
+        help="target id or name to include; may be repeated",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        help="JSON file to resume aggregates from and save them back to",
+    )
+    parser.add_argument("--output", type=Path, default=REPORT_PATH, help="Markdown report path")
+    parser.add_argument("--json", type=Path, help="also write the summary as JSON")
+    parser.add_argument("--csv", type=Path, help="also write the summary as CSV")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not Path(args.db).exists():
+        sys.exit(f"Database not found: {args.db}")
+
+    conn = sqlite3.connect(args.db)
+    conn.row_factory = sqlite3.Row
+    try:
+        targets = conn.execute("SELECT id, name, url FROM targets ORDER BY id").fetchall()
+        target_ids = None
+        if args.target:
+            wanted = set(args.target)
+            targets = [
+                target
+                for target in targets
+                if str(target["id"]) in wanted or target["name"] in wanted
+            ]
+            unknown = wanted - {str(target["id"]) for target in targets} - {
+                target["name"] for target in targets
+            }
+            if unknown:
+                parser.error(f"unknown --target: {', '.join(sorted(unknown))}")
+            target_ids = [target["id"] for target in targets]
+
+        filters = {
+            "db": str(Path(args.db).resolve()),
+            "since": args.since,
+            "until": args.until,
+            "target_ids": target_ids,
+        }
+        state = None
+        if args.checkpoint and args.checkpoint.exists():
+            checkpoint = json.loads(args.checkpoint.read_text(encoding="utf-8"))
+            if checkpoint["filters"] != filters:
+                sys.exit(
+                    f"Checkpoint {args.checkpoint} was built with different filters: {checkpoint['filters']}"
+                )
+            state = checkpoint["state"]
+
+        state = aggregate(conn, args.since, args.until, target_ids, state, args.chunk_size)
+    finally:
+        conn.close()
+
+    summary = summarize(targets, state)
+    _write(args.output, render_markdown(summary))
+    print(f"Report written to {args.output}")
+
+    if args.json:
+        _write(args.json, json.dumps(summary, indent=2))
+        print(f"JSON written to {args.json}")
+
+    if args.csv:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(summary)
+        _write(args.csv, buffer.getvalue())
+        print(f"CSV written to {args.csv}")
 
-    REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    REPORT_PATH.write_text("\n".join(lines), encoding="utf-8")
-    print(f"Report written to {REPORT_PATH}")
+    # Only advance the checkpoint once every output for this run exists.
+    if args.checkpoint:
+        _write(args.checkpoint, json.dumps({"filters": filters, "state": state}))
 
 
 if __name__ == "__main__":
@@ -4,7 +4,8 @@ from fastapi import APIRouter, Query
 
 from net_detective.core.config import settings
 from net_detective.core.db import get_connection
-from net_detective.core.prober import is_success
+from net_detective.core.config import parse_windows
+from net_detective.core.slo import is_success, load_slo_config, slo_engine
 
 router = APIRouter()
 
@@ -110,6 +111,17 @@ def dashboard_timeseries(target_id: int, minutes: int = Query(60, ge=1)):
 
 @router.get("/api/dashboard/availability")
 def dashboard_availability(target_id: int, hours: int = Query(24, ge=1)):
+    with get_connection() as conn:
+        target = conn.execute("SELECT id FROM targets WHERE id = ?", (target_id,)).fetchone()
+        config = load_slo_config(conn, target_id) if target else None
+
+    # Serve configured SLO windows from the incremental counters once warm.
+    if config and hours * 3600 in parse_windows(config["windows"]).values():
+        snapshot = slo_engine.snapshot(target_id)
+        for window in snapshot["windows"] if snapshot else []:
+            if window["seconds"] == hours * 3600:
+                return {"target_id": target_id, "hours": hours, "availability": window["availability"]}
+
     since_ts = _since_hours(hours)
     with get_connection() as conn:
         rows = conn.execute(
@@ -0,0 +1,95 @@
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
+
+from net_detective.core.db import get_connection
+from net_detective.core.config import parse_windows
+from net_detective.core.slo import load_slo_config, slo_engine
+
+router = APIRouter()
+
+
+class SloIn(BaseModel):
+    objective: float = Field(..., gt=0, lt=1)
+    windows: list[str] = Field(..., min_length=1)
+    burn_rate_threshold: float = Field(..., gt=0)
+
+
+def _require_target(conn, target_id: int) -> None:
+    row = conn.execute("SELECT id FROM targets WHERE id = ?", (target_id,)).fetchone()
+    if not row:
+        raise HTTPException(status_code=404, detail="Target not found")
+
+
+@router.get("/api/slo")
+def list_slo():
+    with get_connection() as conn:
+        rows = conn.execute("SELECT id, name FROM targets ORDER BY id").fetchall()
+    # Warm every cold target in one background pass rather than per request.
+    slo_engine.warm_in_background([row["id"] for row in rows])
+    targets = []
+    for row in rows:
+        snapshot = slo_engine.snapshot(row["id"])
+        if snapshot is None:
+            targets.append({"target_id": row["id"], "name": row["name"], "warming": True})
+        else:
+            targets.append({"target_id": row["id"], "name": row["name"], "warming": False, **snapshot})
+    return {"targets": targets}
+
+
+@router.get("/api/slo/{target_id}")
+def get_slo(target_id: int):
+    with get_connection() as conn:
+        _require_target(conn, target_id)
+    snapshot = slo_engine.snapshot(target_id)
+    if snapshot is None:
+        raise HTTPException(status_code=503, detail="SLO state is still warming up")
+    return {"target_id": target_id, **snapshot}
+
+
+@router.get("/api/slo/{target_id}/config")
+def get_slo_config(target_id: int):
+    with get_connection() as conn:
+        _require_target(conn, target_id)
+        config = load_slo_config(conn, target_id)
+    return {
+        "target_id": target_id,
+        "objective": config["objective"],
+        "windows": list(parse_windows(config["windows"])),
+        "burn_rate_threshold": config["burn_rate_threshold"],
+    }
+
+
+@router.put("/api/slo/{target_id}/config")
+def update_slo_config(target_id: int, payload: SloIn):
+    try:
+        windows = parse_windows(payload.windows)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+    with get_connection() as conn:
+        _require_target(conn, target_id)
+        conn.execute(
+            """
+            INSERT INTO slo_configs (target_id, objective, windows, burn_rate_threshold)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(target_id) DO UPDATE SET
+                objective = excluded.objective,
+                windows = excluded.windows,
+                burn_rate_threshold = excluded.burn_rate_threshold
+            """,
+            (
+                target_id,
+                payload.objective,
+                ",".join(windows),
+                payload.burn_rate_threshold,
+            ),
+        )
+
+    slo_engine.invalidate(target_id)
+    slo_engine.warm_in_background([target_id])
+    return {
+        "target_id": target_id,
+        "objective": payload.objective,
+        "windows": list(windows),
+        "burn_rate_threshold": payload.burn_rate_threshold,
+    }
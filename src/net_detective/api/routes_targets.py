@@ -3,6 +3,7 @@ from pydantic import BaseModel, Field
 
 from net_detective.core.db import get_connection
 from net_detective.core.scheduler import remove_target_job, schedule_target
+from net_detective.core.slo import slo_engine
 
 router = APIRouter()
 
@@ -105,6 +106,8 @@ def delete_target(target_id: int, request: Request):
         conn.execute("DELETE FROM targets WHERE id = ?", (target_id,))
         conn.execute("DELETE FROM probe_results WHERE target_id = ?", (target_id,))
         conn.execute("DELETE FROM alerts WHERE target_id = ?", (target_id,))
+        conn.execute("DELETE FROM slo_configs WHERE target_id = ?", (target_id,))
 
     remove_target_job(request.app.state.scheduler, target_id)
+    slo_engine.forget(target_id)
     return {"status": "deleted"}
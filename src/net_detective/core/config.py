@@ -1,10 +1,30 @@
 import os
+import re
 from dataclasses import dataclass
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
+WINDOW_UNITS = {"m": 60, "h": 3600, "d": 86400}
+_WINDOW_PATTERN = re.compile(r"^(\d+)([mhd])$")
+
+
+def parse_window(window: str) -> int:
+    match = _WINDOW_PATTERN.match(window.strip())
+    if not match or int(match.group(1)) <= 0:
+        raise ValueError(f"invalid SLO window: {window!r}")
+    return int(match.group(1)) * WINDOW_UNITS[match.group(2)]
+
+
+def parse_windows(windows: str | list[str]) -> dict[str, int]:
+    if isinstance(windows, str):
+        windows = [item for item in windows.split(",") if item.strip()]
+    if not windows:
+        raise ValueError("at least one SLO window is required")
+    parsed = {window.strip(): parse_window(window) for window in windows}
+    return dict(sorted(parsed.items(), key=lambda item: item[1]))
+
 
 @dataclass(frozen=True)
 class Settings:
@@ -12,6 +32,21 @@ class Settings:
     threshold_ms: int
     fail_n: int
     dashboard_window_minutes: int
+    slo_objective: float
+    slo_windows: str
+    slo_burn_rate_threshold: float
+    slo_min_samples: int
+
+    def __post_init__(self) -> None:
+        if not 0 < self.slo_objective < 1:
+            raise ValueError(f"SLO_OBJECTIVE must be between 0 and 1, got {self.slo_objective}")
+        parse_windows(self.slo_windows)
+        if self.slo_burn_rate_threshold <= 0:
+            raise ValueError(
+                f"SLO_BURN_RATE_THRESHOLD must be positive, got {self.slo_burn_rate_threshold}"
+            )
+        if self.slo_min_samples < 1:
+            raise ValueError(f"SLO_MIN_SAMPLES must be at least 1, got {self.slo_min_samples}")
 
 
 settings = Settings(
@@ -19,4 +54,8 @@ settings = Settings(
     threshold_ms=int(os.getenv("THRESHOLD_MS", "1500")),
     fail_n=int(os.getenv("FAIL_N", "3")),
     dashboard_window_minutes=int(os.getenv("DASHBOARD_WINDOW_MINUTES", "60")),
+    slo_objective=float(os.getenv("SLO_OBJECTIVE", "0.99")),
+    slo_windows=os.getenv("SLO_WINDOWS", "1h,6h,24h,30d"),
+    slo_burn_rate_threshold=float(os.getenv("SLO_BURN_RATE_THRESHOLD", "14.4")),
+    slo_min_samples=int(os.getenv("SLO_MIN_SAMPLES", "10")),
 )
@@ -32,6 +32,12 @@ def init_db() -> None:
             )
             """
         )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_probe_results_target_ts
+            ON probe_results (target_id, ts)
+            """
+        )
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS alerts (
@@ -43,6 +49,17 @@ def init_db() -> None:
             )
             """
         )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS slo_configs (
+                target_id INTEGER PRIMARY KEY,
+                objective REAL NOT NULL,
+                windows TEXT NOT NULL,
+                burn_rate_threshold REAL NOT NULL,
+                FOREIGN KEY(target_id) REFERENCES targets(id)
+            )
+            """
+        )
         conn.commit()
 
 
@@ -7,18 +7,7 @@ import requests
 
 from net_detective.core.config import settings
 from net_detective.core.db import get_connection
-
-
-SUCCESS_MIN = 200
-SUCCESS_MAX = 399
-
-
-def is_success(status_code: int | None, error: str | None) -> bool:
-    if error:
-        return False
-    if status_code is None:
-        return False
-    return SUCCESS_MIN <= status_code <= SUCCESS_MAX
+from net_detective.core.slo import is_success, slo_engine
 
 
 def _measure_dns_time(hostname: str) -> tuple[float | None, str | None]:
@@ -69,7 +58,7 @@ def probe_target(target_id: int) -> None:
     ts = datetime.now(timezone.utc).isoformat()
 
     with get_connection() as conn:
-        conn.execute(
+        cursor = conn.execute(
             """
             INSERT INTO probe_results
             (target_id, status_code, response_time_ms, dns_time_ms, error, ts)
@@ -84,12 +73,14 @@ def probe_target(target_id: int) -> None:
                 ts,
             ),
         )
+        probe_id = cursor.lastrowid
 
-    _evaluate_alerts(target_id, status_code, response_time_ms, error, ts)
+    _evaluate_alerts(target_id, probe_id, status_code, response_time_ms, error, ts)
 
 
 def _evaluate_alerts(
     target_id: int,
+    probe_id: int,
     status_code: int | None,
     response_time_ms: float | None,
     error: str,
@@ -121,6 +112,30 @@ def _evaluate_alerts(
         if not previous_failure:
             alerts.append(f"consecutive failures reached {settings.fail_n}")
 
+    _store_alerts(target_id, alerts, ts)
+
+    # SLO tracking must never stop the alerts above from being stored.
+    try:
+        burn_started, slo = slo_engine.record(
+            target_id, probe_id, ts, is_success(status_code, error)
+        )
+    except Exception as exc:
+        print(f"[SLO] target={target_id} failed to record probe {probe_id}: {exc}")
+        return
+
+    if burn_started:
+        rates = " and ".join(
+            f"{window['burn_rate']:.1f}x over {window['window']}"
+            for window in slo["windows"][:2]
+        )
+        _store_alerts(
+            target_id,
+            [f"error budget burn rate {rates} exceeded {slo['burn_rate_threshold']}"],
+            ts,
+        )
+
+
+def _store_alerts(target_id: int, alerts: list[str], ts: str) -> None:
     if not alerts:
         return
 
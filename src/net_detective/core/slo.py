@@ -0,0 +1,313 @@
+import threading
+from array import array
+from datetime import datetime, timedelta, timezone
+
+from net_detective.core.config import parse_windows, settings
+from net_detective.core.db import get_connection
+
+
+SUCCESS_MIN = 200
+SUCCESS_MAX = 399
+
+
+def is_success(status_code: int | None, error: str | None) -> bool:
+    if error:
+        return False
+    if status_code is None:
+        return False
+    return SUCCESS_MIN <= status_code <= SUCCESS_MAX
+
+
+def _epoch(ts: str) -> float:
+    return datetime.fromisoformat(ts).timestamp()
+
+
+class WindowCounter:
+    """Success/total counts for one window over the tracker's event log."""
+
+    __slots__ = ("seconds", "start", "success", "total")
+
+    def __init__(self, seconds: int) -> None:
+        self.seconds = seconds
+        self.start = 0
+        self.success = 0
+        self.total = 0
+
+
+class SloTracker:
+    """Incremental multi-window SLO state for a single target.
+
+    Probes are appended to a compact time-ordered log. Every window keeps a
+    cursor to its oldest probe and running counts, so a window covers exactly
+    the probes with ``now - seconds <= ts <= now``. Each cursor only moves
+    forward, which keeps the work per probe amortised O(1) per window.
+    """
+
+    # Drop expired log entries once at least this many have piled up.
+    COMPACT_AFTER = 4096
+
+    def __init__(
+        self,
+        objective: float,
+        windows: dict[str, int],
+        burn_rate_threshold: float,
+        min_samples: int = 1,
+    ) -> None:
+        self.objective = objective
+        self.windows = windows
+        self.burn_rate_threshold = burn_rate_threshold
+        self.min_samples = min_samples
+        self.counters = {name: WindowCounter(seconds) for name, seconds in windows.items()}
+        self.times = array("d")
+        self.outcomes = bytearray()
+        self.last_id = 0
+        self.alerting = False
+
+    def add(self, epoch: float, success: bool) -> None:
+        # Probes for one target arrive in time order; never let the log go backwards.
+        if self.times and epoch < self.times[-1]:
+            epoch = self.times[-1]
+        self.times.append(epoch)
+        self.outcomes.append(int(success))
+        for counter in self.counters.values():
+            counter.success += int(success)
+            counter.total += 1
+        self.advance(epoch)
+
+    def advance(self, epoch: float) -> None:
+        times = self.times
+        outcomes = self.outcomes
+        for counter in self.counters.values():
+            floor = epoch - counter.seconds
+            index = counter.start
+            while index < len(times) and times[index] < floor:
+                counter.success -= outcomes[index]
+                counter.total -= 1
+                index += 1
+            counter.start = index
+        self._compact()
+
+    def _compact(self) -> None:
+        head = min(counter.start for counter in self.counters.values())
+        if head < self.COMPACT_AFTER or head * 2 < len(self.times):
+            return
+        del self.times[:head]
+        del self.outcomes[:head]
+        for counter in self.counters.values():
+            counter.start -= head
+
+    def availability(self, window: str) -> float | None:
+        counter = self.counters[window]
+        return (counter.success / counter.total) if counter.total else None
+
+    def burn_rate(self, window: str) -> float | None:
+        counter = self.counters[window]
+        if not counter.total:
+            return None
+        error_rate = (counter.total - counter.success) / counter.total
+        return error_rate / (1 - self.objective)
+
+    def error_budget_remaining(self) -> float | None:
+        # The longest window is the compliance period the budget is spent against.
+        counter = self.counters[next(reversed(self.counters))]
+        if not counter.total:
+            return None
+        budget = counter.total * (1 - self.objective)
+        return 1 - (counter.total - counter.success) / budget
+
+    def burn_alert_windows(self) -> list[str]:
+        # A fast window confirms the burn is ongoing, the next one that it is
+        # significant; both must exceed the threshold.
+        return list(self.counters)[:2]
+
+    def is_burning(self) -> bool:
+        for window in self.burn_alert_windows():
+            # Too few probes say nothing about the error rate; FAIL_N covers those.
+            if self.counters[window].total < self.min_samples:
+                return False
+            rate = self.burn_rate(window)
+            if rate is None or rate < self.burn_rate_threshold:
+                return False
+        return True
+
+    def snapshot(self) -> dict:
+        return {
+            "objective": self.objective,
+            "burn_rate_threshold": self.burn_rate_threshold,
+            "error_budget_remaining": self.error_budget_remaining(),
+            "alerting": self.alerting,
+            "windows": [
+                {
+                    "window": name,
+                    "seconds": seconds,
+                    "success": self.counters[name].success,
+                    "total": self.counters[name].total,
+                    "availability": self.availability(name),
+                    "burn_rate": self.burn_rate(name),
+                }
+                for name, seconds in self.windows.items()
+            ],
+        }
+
+
+def load_slo_config(conn, target_id: int) -> dict:
+    row = conn.execute(
+        "SELECT objective, windows, burn_rate_threshold FROM slo_configs WHERE target_id = ?",
+        (target_id,),
+    ).fetchone()
+    if row:
+        return dict(row)
+    return {
+        "objective": settings.slo_objective,
+        "windows": settings.slo_windows,
+        "burn_rate_threshold": settings.slo_burn_rate_threshold,
+    }
+
+
+class SloEngine:
+    """Process-wide registry of per-target trackers.
+
+    Trackers are warmed off the request and probe threads: the backfill of
+    the longest window runs in a background thread, and probes recorded while
+    a target is warming are buffered and folded in once it is ready. Until
+    then ``snapshot`` returns ``None``.
+    """
+
+    def __init__(self) -> None:
+        self._trackers: dict[int, SloTracker] = {}
+        self._generations: dict[int, int] = {}
+        self._pending: dict[int, list[tuple[int, float, bool]]] = {}
+        self._warming: set[int] = set()
+        self._lock = threading.Lock()
+        self.background = True
+
+    def _build(self, target_id: int) -> SloTracker | None:
+        with get_connection() as conn:
+            if not conn.execute("SELECT id FROM targets WHERE id = ?", (target_id,)).fetchone():
+                return None
+            config = load_slo_config(conn, target_id)
+            tracker = SloTracker(
+                objective=config["objective"],
+                windows=parse_windows(config["windows"]),
+                burn_rate_threshold=config["burn_rate_threshold"],
+                min_samples=settings.slo_min_samples,
+            )
+            now = datetime.now(timezone.utc)
+            since_ts = (now - timedelta(seconds=max(tracker.windows.values()))).isoformat()
+            rows = conn.execute(
+                """
+                SELECT id, status_code, error, ts
+                FROM probe_results
+                WHERE target_id = ? AND ts >= ?
+                ORDER BY ts ASC
+                """,
+                (target_id, since_ts),
+            )
+            for row in rows:
+                tracker.add(_epoch(row["ts"]), is_success(row["status_code"], row["error"]))
+                tracker.last_id = max(tracker.last_id, row["id"])
+        tracker.advance(now.timestamp())
+        # A burn that was already under way before this rebuild has been alerted on.
+        tracker.alerting = tracker.is_burning()
+        return tracker
+
+    def warm(self, target_id: int) -> None:
+        """Build and cache the tracker for ``target_id`` on the calling thread."""
+        with self._lock:
+            generation = self._generations.get(target_id, 0)
+        try:
+            tracker = self._build(target_id)
+        except Exception as exc:
+            print(f"[SLO] target={target_id} backfill failed: {exc}")
+            tracker = None
+
+        with self._lock:
+            if self._generations.get(target_id, 0) != generation:
+                # The config changed while building; the newer warm-up wins.
+                return
+            self._warming.discard(target_id)
+            pending = self._pending.pop(target_id, [])
+            if tracker is None:
+                return
+            for probe_id, epoch, success in pending:
+                if probe_id > tracker.last_id:
+                    tracker.add(epoch, success)
+                    tracker.last_id = probe_id
+            self._trackers[target_id] = tracker
+
+    def warm_in_background(self, target_ids: list[int]) -> None:
+        with self._lock:
+            target_ids = [
+                target_id
+                for target_id in target_ids
+                if target_id not in self._warming and target_id not in self._trackers
+            ]
+            self._warming.update(target_ids)
+        if not target_ids:
+            return
+
+        def run() -> None:
+            for target_id in target_ids:
+                self.warm(target_id)
+
+        if self.background:
+            threading.Thread(target=run, name="slo-warm", daemon=True).start()
+        else:
+            run()
+
+    def record(self, target_id: int, probe_id: int, ts: str, success: bool) -> tuple[bool, dict | None]:
+        """Fold the stored probe ``probe_id`` into the target's tracker.
+
+        Returns whether a burn-rate alert just started, plus the snapshot
+        (``None`` while the target is still warming).
+        """
+        epoch = _epoch(ts)
+        with self._lock:
+            tracker = self._trackers.get(target_id)
+            if tracker is None:
+                self._pending.setdefault(target_id, []).append((probe_id, epoch, success))
+        if tracker is None:
+            self.warm_in_background([target_id])
+            return False, None
+
+        with self._lock:
+            if probe_id > tracker.last_id:
+                tracker.add(epoch, success)
+                tracker.last_id = probe_id
+            burning = tracker.is_burning()
+            started = burning and not tracker.alerting
+            tracker.alerting = burning
+            return started, tracker.snapshot()
+
+    def snapshot(self, target_id: int, now: datetime | None = None) -> dict | None:
+        """Current SLO state, or ``None`` if the target is unknown or still warming."""
+        with self._lock:
+            tracker = self._trackers.get(target_id)
+        if tracker is None:
+            self.warm_in_background([target_id])
+            with self._lock:
+                tracker = self._trackers.get(target_id)
+            if tracker is None:
+                return None
+
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            tracker.advance(now.timestamp())
+            # Windows drain when probing stops; only record() may start an alert.
+            if tracker.alerting and not tracker.is_burning():
+                tracker.alerting = False
+            return tracker.snapshot()
+
+    def invalidate(self, target_id: int) -> None:
+        with self._lock:
+            self._trackers.pop(target_id, None)
+            self._warming.discard(target_id)
+            self._generations[target_id] = self._generations.get(target_id, 0) + 1
+
+    def forget(self, target_id: int) -> None:
+        self.invalidate(target_id)
+        with self._lock:
+            self._pending.pop(target_id, None)
+
+
+slo_engine = SloEngine()
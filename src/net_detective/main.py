@@ -4,9 +4,10 @@ from fastapi import FastAPI
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
-from net_detective.api import alerts_router, dashboard_router, health_router, targets_router
+from net_detective.api import alerts_router, dashboard_router, health_router, slo_router, targets_router
 from net_detective.core.db import get_connection, init_db
 from net_detective.core.scheduler import create_scheduler, schedule_target
+from net_detective.core.slo import slo_engine
 
 
 def create_app() -> FastAPI:
@@ -23,6 +24,7 @@ def create_app() -> FastAPI:
     app.include_router(targets_router)
     app.include_router(dashboard_router)
     app.include_router(alerts_router)
+    app.include_router(slo_router)
 
     @app.on_event("startup")
     def startup_event() -> None:
@@ -39,6 +41,8 @@ def create_app() -> FastAPI:
         for target in targets:
             schedule_target(scheduler, dict(target))
 
+        slo_engine.warm_in_background([target["id"] for target in targets])
+
     @app.on_event("shutdown")
     def shutdown_event() -> None:
         scheduler = getattr(app.state, "scheduler", None)
@@ -0,0 +1,179 @@
+import dataclasses
+import importlib.util
+import json
+import random
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from net_detective.core import db
+from net_detective.core.slo import is_success
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "generate_report.py"
+spec = importlib.util.spec_from_file_location("generate_report", SCRIPT)
+generate_report = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(generate_report)
+
+
+@pytest.fixture
+def make_db(monkeypatch):
+    def make(path: Path, rows: int, start: int = 0) -> sqlite3.Connection:
+        monkeypatch.setattr(db, "settings", dataclasses.replace(db.settings, db_path=str(path)))
+        db.init_db()
+        return fill_db(path, rows, start)
+
+    return make
+
+
+def fill_db(path: Path, rows: int, start: int) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executemany(
+        """
+        INSERT OR IGNORE INTO targets (id, name, url, interval_sec, timeout_sec, enabled)
+        VALUES (?, ?, ?, 5, 1, 1)
+        """,
+        [(1, "a", "http://a"), (2, "b", "http://b")],
+    )
+    rng = random.Random(start)
+    for i in range(start, start + rows):
+        ts = f"2026-01-01T{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}+00:00"
+        status = rng.choice([200, 200, 200, 301, 500, None])
+        conn.execute(
+            "INSERT INTO probe_results (target_id, status_code, response_time_ms, error, ts) VALUES (?, ?, ?, ?, ?)",
+            (
+                rng.choice([1, 2]),
+                status,
+                rng.lognormvariate(4, 1) if status else None,
+                "" if status else "timeout",
+                ts,
+            ),
+        )
+        if rng.random() < 0.05:
+            conn.execute(
+                "INSERT INTO alerts (target_id, message, ts) VALUES (?, 'x', ?)",
+                (rng.choice([1, 2]), ts),
+            )
+    conn.commit()
+    return conn
+
+
+def brute_force(conn, target_id, since=None):
+    where = "target_id = ?" + (" AND ts >= ?" if since else "")
+    params = (target_id, since) if since else (target_id,)
+    rows = conn.execute(f"SELECT * FROM probe_results WHERE {where}", params).fetchall()
+    times = sorted(row["response_time_ms"] for row in rows if row["response_time_ms"] is not None)
+    success = sum(1 for row in rows if is_success(row["status_code"], row["error"]))
+    alerts = conn.execute(f"SELECT COUNT(*) FROM alerts WHERE {where}", params).fetchone()[0]
+    return {
+        "availability": success / len(rows),
+        "avg": sum(times) / len(times),
+        "p95": times[int(round(0.95 * (len(times) - 1)))],
+        "failures": len(rows) - success,
+        "alerts": alerts,
+    }
+
+
+def assert_matches(summary, conn, since=None):
+    for item in summary:
+        expected = brute_force(conn, item["target_id"], since)
+        assert item["availability"] == pytest.approx(expected["availability"])
+        assert item["avg_response_time_ms"] == pytest.approx(expected["avg"])
+        assert item["p95_response_time_ms"] == pytest.approx(expected["p95"], rel=0.01)
+        assert item["failures"] == expected["failures"]
+        assert item["alerts"] == expected["alerts"]
+
+
+def test_streamed_aggregates_match_brute_force(tmp_path, make_db):
+    conn = make_db(tmp_path / "report.db", 3000)
+    targets = conn.execute("SELECT id, name, url FROM targets ORDER BY id").fetchall()
+
+    state = generate_report.aggregate(conn, chunk_size=128)
+    assert_matches(generate_report.summarize(targets, state), conn)
+
+    since = "2026-01-01T00:20:00+00:00"
+    state = generate_report.aggregate(conn, since=since, chunk_size=128)
+    assert_matches(generate_report.summarize(targets, state), conn, since)
+
+
+def test_checkpoint_resume_and_outputs(tmp_path, make_db):
+    db_path = tmp_path / "report.db"
+    checkpoint = tmp_path / "checkpoint.json"
+    args = [
+        "--db", str(db_path),
+        "--checkpoint", str(checkpoint),
+        "--output", str(tmp_path / "report.md"),
+        "--json", str(tmp_path / "report.json"),
+        "--csv", str(tmp_path / "report.csv"),
+        "--target", "a",
+    ]
+    make_db(db_path, 1000).close()
+    generate_report.main(args)
+    first_state = json.loads(checkpoint.read_text())["state"]
+
+    conn = make_db(db_path, 1000, start=1000)
+    generate_report.main(args)
+
+    summary = json.loads((tmp_path / "report.json").read_text())
+    assert [item["name"] for item in summary] == ["a"]
+    assert_matches(summary, conn)
+    assert json.loads(checkpoint.read_text())["state"]["last_probe_id"] > first_state["last_probe_id"]
+    assert "| a |" in (tmp_path / "report.md").read_text()
+    assert (tmp_path / "report.csv").read_text().splitlines()[0].startswith("target_id,name")
+
+
+def test_checkpoint_guards(tmp_path, capsys, make_db):
+    db_path = tmp_path / "report.db"
+    other_db = tmp_path / "other.db"
+    checkpoint = tmp_path / "checkpoint.json"
+    make_db(db_path, 100).close()
+    make_db(other_db, 100).close()
+
+    with pytest.raises(SystemExit):
+        generate_report.main(["--db", str(db_path), "--since", "yesterday"])
+    assert "invalid ISO timestamp" in capsys.readouterr().err
+
+    # An output that cannot be written must not advance the checkpoint.
+    (tmp_path / "blocked").mkdir()
+    with pytest.raises(OSError):
+        generate_report.main([
+            "--db", str(db_path),
+            "--checkpoint", str(checkpoint),
+            "--output", str(tmp_path / "report.md"),
+            "--json", str(tmp_path / "blocked"),
+        ])
+    assert not checkpoint.exists()
+
+    generate_report.main([
+        "--db", str(db_path),
+        "--checkpoint", str(checkpoint),
+        "--output", str(tmp_path / "report.md"),
+    ])
+    saved = checkpoint.read_text()
+    capsys.readouterr()
+
+    with pytest.raises(SystemExit) as exc_info:
+        generate_report.main([
+            "--db", str(other_db),
+            "--checkpoint", str(checkpoint),
+            "--output", str(tmp_path / "other.md"),
+        ])
+    assert "different filters" in str(exc_info.value.code)
+    assert checkpoint.read_text() == saved
+    assert not (tmp_path / "other.md").exists()
+
+    with pytest.raises(SystemExit) as exc_info:
+        generate_report.main([
+            "--db", str(db_path),
+            "--output", str(tmp_path / "other.md"),
+            "--target", "a",
+            "--target", "nosuch",
+        ])
+    assert exc_info.value.code == 2
+    assert "unknown --target: nosuch" in capsys.readouterr().err
+    assert not (tmp_path / "other.md").exists()
+
+    with pytest.raises(SystemExit) as exc_info:
+        generate_report.main(["--db", str(tmp_path / "missing.db")])
+    assert "Database not found" in str(exc_info.value.code)
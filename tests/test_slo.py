@@ -0,0 +1,251 @@
+import dataclasses
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from net_detective.core import db, prober, slo
+from net_detective.core.config import parse_windows, settings
+from net_detective.core.slo import SloTracker
+from net_detective.main import app
+
+WINDOWS = parse_windows("5m,1h,6h")
+
+
+def brute_force(events, now, window_seconds):
+    selected = [ok for ts, ok in events if now - window_seconds <= ts <= now]
+    return sum(selected), len(selected)
+
+
+def test_parse_windows_sorts_by_length():
+    assert parse_windows("30d, 1h,6h") == {"1h": 3600, "6h": 21600, "30d": 2592000}
+    with pytest.raises(ValueError):
+        parse_windows("1w")
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [{"slo_objective": 1.0}, {"slo_objective": 0.0}, {"slo_windows": "1w"}, {"slo_min_samples": 0}],
+)
+def test_settings_reject_invalid_slo(overrides):
+    with pytest.raises(ValueError):
+        dataclasses.replace(settings, **overrides)
+
+
+def test_tracker_matches_brute_force():
+    rng = random.Random(7)
+    tracker = SloTracker(0.99, WINDOWS, 14.4)
+    tracker.COMPACT_AFTER = 64
+    events = []
+    now = 1_700_000_000.0
+    for _ in range(1500):
+        now += rng.choice([0.25, 1, 5, 30, 90, 600])
+        ok = rng.random() > 0.1
+        tracker.add(now, ok)
+        events.append((now, ok))
+        for name, seconds in WINDOWS.items():
+            counter = tracker.counters[name]
+            assert (counter.success, counter.total) == brute_force(events, now, seconds)
+        # Probe the exact window edges as well.
+        for name, seconds in WINDOWS.items():
+            edge = events[-1][0] + seconds - rng.choice([0, 0.5, 59])
+            if edge >= now:
+                now = edge
+                tracker.advance(now)
+                counter = tracker.counters[name]
+                assert (counter.success, counter.total) == brute_force(events, now, seconds)
+
+    later = now + 2 * 3600
+    tracker.advance(later)
+    for name, seconds in WINDOWS.items():
+        counter = tracker.counters[name]
+        assert (counter.success, counter.total) == brute_force(events, later, seconds)
+
+
+def test_burn_rate_and_budget():
+    tracker = SloTracker(0.9, WINDOWS, 2.0, min_samples=10)
+    start = 1_700_000_000.0
+    for i in range(10):
+        tracker.add(start + i, i >= 3)
+
+    assert tracker.availability("5m") == pytest.approx(0.7)
+    assert tracker.burn_rate("5m") == pytest.approx(3.0)
+    assert tracker.error_budget_remaining() == pytest.approx(-2.0)
+    assert tracker.is_burning()
+
+    tracker.min_samples = 11
+    assert not tracker.is_burning()
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "settings", dataclasses.replace(db.settings, db_path=str(tmp_path / "slo.db")))
+    monkeypatch.setattr(slo.slo_engine, "_trackers", {})
+    monkeypatch.setattr(slo.slo_engine, "_generations", {})
+    monkeypatch.setattr(slo.slo_engine, "_pending", {})
+    monkeypatch.setattr(slo.slo_engine, "_warming", set())
+    monkeypatch.setattr(slo.slo_engine, "background", False)
+    db.init_db()
+    return slo.slo_engine
+
+
+def add_target(conn):
+    return conn.execute(
+        "INSERT INTO targets (name, url, interval_sec, timeout_sec, enabled) VALUES ('t', 'http://t', 5, 1, 1)"
+    ).lastrowid
+
+
+def add_probe(conn, target_id, ts, status_code=200):
+    return conn.execute(
+        "INSERT INTO probe_results (target_id, status_code, error, ts) VALUES (?, ?, ?, ?)",
+        (target_id, status_code, "" if status_code == 200 else "HTTP 500", ts.isoformat()),
+    ).lastrowid
+
+
+def test_engine_backfill_and_alert(temp_db):
+    now = datetime.now(timezone.utc)
+    with db.get_connection() as conn:
+        target_id = add_target(conn)
+        for i in range(20):
+            add_probe(conn, target_id, now - timedelta(minutes=30, seconds=i))
+
+    snapshot = temp_db.snapshot(target_id, now)
+    windows = {window["window"]: window for window in snapshot["windows"]}
+    assert windows["1h"]["total"] == 20
+    assert windows["1h"]["availability"] == 1.0
+    assert not snapshot["alerting"]
+
+    started = []
+    for i in range(20):
+        ts = now + timedelta(seconds=i)
+        with db.get_connection() as conn:
+            probe_id = add_probe(conn, target_id, ts, status_code=500)
+        fired, _ = temp_db.record(target_id, probe_id, ts.isoformat(), False)
+        started.append(fired)
+    assert started.count(True) == 1
+
+    # Once probing stops and the windows drain, the alert clears.
+    assert temp_db.snapshot(target_id, now + timedelta(minutes=1))["alerting"]
+    assert not temp_db.snapshot(target_id, now + timedelta(hours=7))["alerting"]
+
+    # A rebuild while the burn is ongoing must not alert again.
+    temp_db.invalidate(target_id)
+    temp_db.warm(target_id)
+    ts = now + timedelta(seconds=30)
+    with db.get_connection() as conn:
+        probe_id = add_probe(conn, target_id, ts, status_code=500)
+    fired, _ = temp_db.record(target_id, probe_id, ts.isoformat(), False)
+    assert not fired
+
+
+def test_engine_does_not_double_count_backfilled_probe(temp_db):
+    now = datetime.now(timezone.utc)
+    with db.get_connection() as conn:
+        target_id = add_target(conn)
+        probe_id = add_probe(conn, target_id, now)
+
+    # A reader builds the tracker between the insert and record().
+    temp_db.snapshot(target_id)
+    _, snapshot = temp_db.record(target_id, probe_id, now.isoformat(), True)
+    assert snapshot["windows"][0]["total"] == 1
+
+
+def test_engine_buffers_probes_while_warming(temp_db, monkeypatch):
+    now = datetime.now(timezone.utc)
+    with db.get_connection() as conn:
+        target_id = add_target(conn)
+        probe_id = add_probe(conn, target_id, now)
+
+    # Recording on a cold target only queues the probe and schedules a warm-up.
+    monkeypatch.setattr(temp_db, "warm_in_background", lambda target_ids: None)
+    assert temp_db.record(target_id, probe_id, now.isoformat(), True) == (False, None)
+    assert temp_db.snapshot(target_id) is None
+
+    temp_db.warm(target_id)
+    assert temp_db.snapshot(target_id)["windows"][0]["total"] == 1
+    assert temp_db._pending == {}
+
+
+def test_engine_lone_failure_does_not_alert(temp_db):
+    now = datetime.now(timezone.utc)
+    with db.get_connection() as conn:
+        target_id = add_target(conn)
+    temp_db.warm(target_id)
+
+    fired = []
+    for i in range(settings.slo_min_samples):
+        ts = now + timedelta(seconds=i)
+        with db.get_connection() as conn:
+            probe_id = add_probe(conn, target_id, ts, status_code=500)
+        fired.append(temp_db.record(target_id, probe_id, ts.isoformat(), False)[0])
+    assert fired == [False] * (settings.slo_min_samples - 1) + [True]
+
+
+def test_prober_stores_alerts_when_slo_fails(temp_db, monkeypatch):
+    monkeypatch.setattr(prober, "settings", dataclasses.replace(prober.settings, fail_n=1))
+
+    def broken_record(*args):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(temp_db, "record", broken_record)
+    now = datetime.now(timezone.utc)
+    with db.get_connection() as conn:
+        target_id = add_target(conn)
+        probe_id = add_probe(conn, target_id, now, status_code=500)
+
+    prober._evaluate_alerts(target_id, probe_id, 500, 10.0, "HTTP 500", now.isoformat())
+    with db.get_connection() as conn:
+        messages = [row["message"] for row in conn.execute("SELECT message FROM alerts")]
+    assert messages == ["consecutive failures reached 1"]
+
+
+def test_engine_ignores_unknown_target(temp_db):
+    assert temp_db.snapshot(987654) is None
+    assert 987654 not in temp_db._trackers
+
+
+def test_dashboard_availability_matches_query(temp_db):
+    now = datetime.now(timezone.utc)
+    with db.get_connection() as conn:
+        target_id = add_target(conn)
+        add_probe(conn, target_id, now - timedelta(minutes=59, seconds=50), status_code=500)
+        add_probe(conn, target_id, now - timedelta(minutes=61))
+        add_probe(conn, target_id, now - timedelta(minutes=1))
+        add_probe(conn, target_id, now - timedelta(hours=3))
+
+    client = TestClient(app)
+    for hours, expected in [(2, 2 / 3), (1, 0.5), (6, 0.75)]:
+        response = client.get("/api/dashboard/availability", params={"target_id": target_id, "hours": hours})
+        assert response.status_code == 200
+        assert response.json()["availability"] == pytest.approx(expected)
+        # Unconfigured windows never touch the engine.
+        assert (target_id in temp_db._trackers) == (hours != 2)
+
+    response = client.get("/api/dashboard/availability", params={"target_id": 987654, "hours": 1})
+    assert response.json()["availability"] is None
+    assert 987654 not in temp_db._trackers
+
+
+def test_slo_config_api(temp_db):
+    with db.get_connection() as conn:
+        target_id = add_target(conn)
+
+    client = TestClient(app)
+    response = client.put(
+        f"/api/slo/{target_id}/config",
+        json={"objective": 0.995, "windows": ["6h", "1h"], "burn_rate_threshold": 6},
+    )
+    assert response.status_code == 200
+    assert response.json()["windows"] == ["1h", "6h"]
+
+    response = client.get(f"/api/slo/{target_id}")
+    assert response.status_code == 200
+    assert [window["window"] for window in response.json()["windows"]] == ["1h", "6h"]
+    assert response.json()["objective"] == 0.995
+
+    assert client.put(
+        f"/api/slo/{target_id}/config",
+        json={"objective": 0.99, "windows": ["1w"], "burn_rate_threshold": 6},
+    ).status_code == 422
+    assert client.get("/api/slo/987654").status_code == 404